@@ -6,19 +6,58 @@ Can be run locally for testing by setting environment variables
 and pointing to downloaded test artifacts.
 """
 
+import hashlib
 import json
 import os
+import re
 import sys
 import xml.etree.ElementTree as ET
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 import subprocess
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+# Below this many files the process pool startup costs more than it saves
+PARALLEL_PARSE_MIN_FILES = 4
+
+# Resubmissions of a load whose earlier job with the same id failed
+MAX_LOAD_ATTEMPTS = 5
+
+ISO_TIMESTAMP_RE = re.compile(r'^\d{4}-\d{2}-\d{2}T')
+
+# Legacy table schema type names -> standard SQL query parameter types
+STANDARD_SQL_TYPES = {'INTEGER': 'INT64', 'FLOAT': 'FLOAT64', 'BOOLEAN': 'BOOL'}
+
+try:
+    from lxml import etree as LET
+except ImportError:
+    LET = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_loads(data):
+    """Parse JSON with orjson when available, stdlib json otherwise."""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _json_dumps(obj, indent=False):
+    """Serialize obj to JSON bytes with orjson when available, stdlib json otherwise."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, default=str, indent=2 if indent else None).encode()
+
 
 def run_git(cmd):
-    """Run a git command and return output, or empty string on failure."""
+    """Run a git command (string or argument list) and return output, or empty string on failure."""
+    args = cmd.split() if isinstance(cmd, str) else list(cmd)
     try:
         result = subprocess.run(
-            ['git'] + cmd.split(),
+            ['git'] + args,
             capture_output=True,
             text=True,
             timeout=10
@@ -37,19 +76,33 @@ def get_bigquery_client():
         print("Error: GCP_SERVICE_ACCOUNT_KEY environment variable not set", file=sys.stderr)
         sys.exit(1)
 
-    sa_key = json.loads(sa_key_json)
+    sa_key = _json_loads(sa_key_json)
     return bigquery.Client.from_service_account_info(sa_key)
 
+def _iter_testcases(xml_path):
+    """Stream <testcase> elements, freeing each one once the caller is done with it."""
+    if LET is not None:
+        for _, testcase in LET.iterparse(str(xml_path), events=('end',), tag='testcase'):
+            yield testcase
+            testcase.clear()
+            while testcase.getprevious() is not None:
+                del testcase.getparent()[0]
+        return
+
+    for _, elem in ET.iterparse(str(xml_path), events=('end',)):
+        if elem.tag == 'testcase':
+            yield elem
+            elem.clear()
+
+
 def parse_junit_xml(xml_path):
     """Parse a single JUnit XML file and yield test results."""
     try:
-        tree = ET.parse(xml_path)
-        root = tree.getroot()
-
-        for testcase in root.findall('.//testcase'):
-            classname = testcase.get('classname', '')
-            name = testcase.get('name', '')
-            time_sec = float(testcase.get('time', 0))
+        for testcase in _iter_testcases(xml_path):
+            attrib = testcase.attrib
+            classname = attrib.get('classname', '')
+            name = attrib.get('name', '')
+            time_sec = float(attrib.get('time', 0))
             duration_ms = int(time_sec * 1000)
 
             failure = testcase.find('failure')
@@ -58,10 +111,10 @@ def parse_junit_xml(xml_path):
 
             if failure is not None:
                 status = 'failed'
-                stack_trace = (failure.get('message', '') + '\n' + (failure.text or ''))[:10000]
+                stack_trace = (failure.attrib.get('message', '') + '\n' + (failure.text or ''))[:10000]
             elif error is not None:
                 status = 'error'
-                stack_trace = (error.get('message', '') + '\n' + (error.text or ''))[:10000]
+                stack_trace = (error.attrib.get('message', '') + '\n' + (error.text or ''))[:10000]
             elif skipped is not None:
                 status = 'skipped'
                 stack_trace = None
@@ -79,6 +132,27 @@ def parse_junit_xml(xml_path):
         print(f"Error parsing {xml_path}: {e}", file=sys.stderr)
 
 
+def _iter_xml_files(root):
+    """Yield paths of *.xml files under root, without building Path objects for every entry."""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith('.xml'):
+                        yield entry.path
+        except OSError as e:
+            print(f"Warning: cannot scan {directory}: {e}", file=sys.stderr)
+
+
+def _parse_one_file(xml_path):
+    """Parse one JUnit XML file into a list (module-level so worker processes can pickle it)."""
+    return list(parse_junit_xml(xml_path))
+
+
 def collect_test_results(test_results_dir):
     """Collect all test results from JUnit XML files in directory."""
     results = []
@@ -88,9 +162,16 @@ def collect_test_results(test_results_dir):
         print(f"Warning: Test results directory not found: {results_path}", file=sys.stderr)
         return results
 
-    for xml_file in results_path.glob("**/*.xml"):
-        for result in parse_junit_xml(xml_file):
-            results.append(result)
+    xml_files = list(_iter_xml_files(str(results_path)))
+
+    if len(xml_files) < PARALLEL_PARSE_MIN_FILES:
+        for xml_file in xml_files:
+            results.extend(_parse_one_file(xml_file))
+        return results
+
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for batch in executor.map(_parse_one_file, xml_files, chunksize=4):
+            results.extend(batch)
 
     return results
 
@@ -99,17 +180,13 @@ def build_commit_metadata(github_run_id, commit_hash, branch, pr_number, pr_base
     """Build commit metadata dict from git and environment."""
     is_anchor_branch = branch == 'main' or branch.startswith('upgrade-v')
 
-    parent_commits = run_git('log -1 --pretty=%P')
-    commit_message = run_git('log -1 --pretty=%s')[:500]
-    commit_author = run_git('log -1 --pretty=%an <%ae>')
-    commit_timestamp_str = run_git('log -1 --pretty=%cI')
+    # One git invocation for all fields; NUL-separated since %s/%an may contain anything else
+    raw = run_git(['log', '-1', '--pretty=format:%P%x00%s%x00%an <%ae>%x00%cI'])
+    parent_commits, commit_message, commit_author, commit_timestamp_str = (raw.split('\0') + [''] * 4)[:4]
+    commit_message = commit_message[:500]
 
-    commit_ts = None
-    if commit_timestamp_str:
-        try:
-            commit_ts = datetime.fromisoformat(commit_timestamp_str).isoformat()
-        except Exception:
-            pass
+    # git's %cI is already strict ISO 8601; only make sure we didn't get garbage
+    commit_ts = commit_timestamp_str if ISO_TIMESTAMP_RE.match(commit_timestamp_str) else None
 
     return {
         'run_id': github_run_id,
@@ -126,13 +203,64 @@ def build_commit_metadata(github_run_id, commit_hash, branch, pr_number, pr_base
     }
 
 
+def _load_job_id(table, rows):
+    """Deterministic load job id for a set of rows, so resubmitting them cannot append duplicates."""
+    digest = hashlib.blake2s(digest_size=16)
+    for row in rows:
+        digest.update(f"{row['run_id']}|{row['test_name']}|{row['status']}\n".encode())
+    run_id = re.sub(r'[^A-Za-z0-9_-]', '_', str(rows[0]['run_id']))
+    return f"{table}_{run_id}_{digest.hexdigest()}"
+
+
+def _load_rows(client, rows, table_id, job_config, location):
+    """Load rows in one job under its deterministic id; returns True on success.
+
+    A job that already exists under that id is reused only if it finished
+    without error; a failed one is retried under a suffixed id so a single bad
+    attempt cannot block the load forever.
+    """
+    from google.api_core.exceptions import Conflict
+
+    base_job_id = _load_job_id('test_runs', rows)
+    for attempt in range(MAX_LOAD_ATTEMPTS):
+        job_id = base_job_id if attempt == 0 else f"{base_job_id}_attempt{attempt}"
+        resubmitted = False
+        try:
+            try:
+                job = client.load_table_from_json(
+                    rows, table_id, job_id=job_id, job_config=job_config, location=location,
+                )
+            except Conflict:
+                # Same rows were already submitted (retry or re-run); check how it went
+                job = client.get_job(job_id, location=location)
+                resubmitted = True
+            job.result()
+        except Exception as e:
+            if resubmitted:
+                print(f"Existing load job {job_id} failed ({e}), retrying under a new id", file=sys.stderr)
+                continue
+            print(f"BigQuery load job failed (test_runs): {e}", file=sys.stderr)
+            return False
+        if job.error_result or job.errors:
+            if resubmitted:
+                print(f"Existing load job {job_id} failed ({job.error_result}), retrying under a new id", file=sys.stderr)
+                continue
+            print(f"BigQuery load errors (test_runs): {job.errors}", file=sys.stderr)
+            return False
+        if resubmitted:
+            print(f"Load job {job_id} already completed, skipping resubmission")
+        return True
+    print(f"BigQuery load for {base_job_id} failed after {MAX_LOAD_ATTEMPTS} attempts", file=sys.stderr)
+    return False
+
+
 def upload_to_bigquery(client, project, dataset, test_results, commit_metadata, dry_run=False):
     """Upload test results and commit metadata to BigQuery."""
 
     if dry_run:
         print("\n=== DRY RUN - Would upload: ===")
         print(f"\nCommit metadata:")
-        print(json.dumps(commit_metadata, indent=2, default=str))
+        print(_json_dumps(commit_metadata, indent=True).decode())
         print(f"\nTest results ({len(test_results)} total):")
         for r in test_results[:5]:
             print(f"  {r['status']:8} {r['test_name'][:60]}")
@@ -140,33 +268,66 @@ def upload_to_bigquery(client, project, dataset, test_results, commit_metadata,
             print(f"  ... and {len(test_results) - 5} more")
         return True
 
-    # Upload test results
+    from google.cloud import bigquery
+
+    # Upload test results in a single load job (no per-row streaming quota).
+    # Rows go up as a file, so the 10MB streaming request cap does not apply.
     if test_results:
         table_id = f"{project}.{dataset}.test_runs"
-        errors = client.insert_rows_json(table_id, test_results)
-        if errors:
-            print(f"BigQuery insert errors (test_runs): {errors}", file=sys.stderr)
+        job_config = bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
+            write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+            schema_update_options=[bigquery.SchemaUpdateOption.ALLOW_FIELD_ADDITION],
+        )
+        try:
+            # Jobs run where the dataset lives; jobs.get needs it for regional datasets
+            location = client.get_dataset(f"{project}.{dataset}").location
+        except Exception as e:
+            print(f"BigQuery dataset lookup failed ({project}.{dataset}): {e}", file=sys.stderr)
+            return False
+        if not _load_rows(client, test_results, table_id, job_config, location):
             return False
-        print(f"Inserted {len(test_results)} test results")
+        print(f"Loaded {len(test_results)} test results")
 
-    # Check if commit metadata already exists (dedup for matrix jobs)
-    check_query = f"""
-        SELECT COUNT(*) as cnt 
-        FROM `{project}.{dataset}.commit_metadata` 
-        WHERE run_id = '{commit_metadata['run_id']}'
+    # Insert commit metadata only if this run_id is not there yet, checked and
+    # inserted in one MERGE. This narrows the window between matrix jobs on the
+    # same run_id but does not close it: BigQuery runs insert-only MERGEs
+    # concurrently, so two jobs can both miss and both insert.
+    metadata_table_id = f"{project}.{dataset}.commit_metadata"
+    try:
+        # Bind each parameter with the column's own type, as insert_rows_json did
+        schema = {f.name: f.field_type for f in client.get_table(metadata_table_id).schema}
+    except Exception as e:
+        print(f"BigQuery table lookup failed (commit_metadata): {e}", file=sys.stderr)
+        return False
+    missing = [name for name in commit_metadata if name not in schema]
+    if missing:
+        print(f"commit_metadata table has no column(s) {missing}", file=sys.stderr)
+        return False
+    columns = ', '.join(commit_metadata)
+    source = ', '.join(f"@{name} AS {name}" for name in commit_metadata)
+    values = ', '.join(f"S.{name}" for name in commit_metadata)
+    merge_query = f"""
+        MERGE `{metadata_table_id}` T
+        USING (SELECT {source}) S
+        ON T.run_id = S.run_id
+        WHEN NOT MATCHED THEN
+            INSERT ({columns}) VALUES ({values})
     """
+    job_config = bigquery.QueryJobConfig(query_parameters=[
+        bigquery.ScalarQueryParameter(
+            name, STANDARD_SQL_TYPES.get(schema[name], schema[name]), value,
+        )
+        for name, value in commit_metadata.items()
+    ])
     try:
-        result = list(client.query(check_query).result())
-        already_exists = result[0].cnt > 0
-    except Exception:
-        already_exists = False
+        job = client.query(merge_query, job_config=job_config)
+        job.result()
+    except Exception as e:
+        print(f"BigQuery merge failed (commit_metadata): {e}", file=sys.stderr)
+        return False
 
-    if not already_exists:
-        table_id = f"{project}.{dataset}.commit_metadata"
-        errors = client.insert_rows_json(table_id, [commit_metadata])
-        if errors:
-            print(f"BigQuery insert errors (commit_metadata): {errors}", file=sys.stderr)
-            return False
+    if job.num_dml_affected_rows:
         print(f"Inserted commit metadata for {commit_metadata['commit_hash'][:8]}")
     else:
         print(f"Commit metadata already exists for run {commit_metadata['run_id']}")
@@ -197,7 +358,7 @@ def main():
     test_group = os.environ.get('MATRIX_TEST_GROUP', 'all')
     run_id = f"{github_run_id}-{test_group}"
     commit_hash = os.environ.get('GITHUB_SHA', run_git('rev-parse HEAD') or 'unknown')
-    run_timestamp = datetime.utcnow().isoformat()
+    run_timestamp = datetime.now(timezone.utc).isoformat(timespec='seconds')
 
     # Branch detection
     ref = os.environ.get('GITHUB_REF', '')
@@ -231,22 +392,19 @@ def main():
         if not args.dry_run:
             sys.exit(1)
 
-    # Enrich with run metadata
-    test_results = []
+    # Enrich with run metadata (in place; parse_junit_xml already yields the per-test fields)
+    run_fields = {
+        'run_id': run_id,
+        'branch': branch,
+        'commit_hash': commit_hash,
+        'run_timestamp': run_timestamp,
+        'test_group': test_group,
+        'test_report_url': test_report_url,
+        'logs_url': logs_url
+    }
     for r in raw_results:
-        test_results.append({
-            'run_id': run_id,
-            'branch': branch,
-            'commit_hash': commit_hash,
-            'run_timestamp': run_timestamp,
-            'test_group': test_group,
-            'test_name': r['test_name'],
-            'status': r['status'],
-            'duration_ms': r['duration_ms'],
-            'stack_trace': r['stack_trace'],
-            'test_report_url': test_report_url,
-            'logs_url': logs_url
-        })
+        r.update(run_fields)
+    test_results = raw_results
 
     # Build commit metadata
     commit_metadata = build_commit_metadata(
@@ -254,9 +412,10 @@ def main():
     )
 
     # Summary
-    failed_count = sum(1 for t in test_results if t['status'] in ('failed', 'error'))
-    passed_count = sum(1 for t in test_results if t['status'] == 'passed')
-    skipped_count = sum(1 for t in test_results if t['status'] == 'skipped')
+    counts = Counter(t['status'] for t in test_results)
+    failed_count = counts['failed'] + counts['error']
+    passed_count = counts['passed']
+    skipped_count = counts['skipped']
     print(f"\nFound: {passed_count} passed, {failed_count} failed, {skipped_count} skipped")
     print(f"Branch: {branch}, Commit: {commit_hash[:8]}")
 
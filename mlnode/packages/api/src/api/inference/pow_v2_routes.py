@@ -82,20 +82,20 @@ async def init_generate(body: PoCInitGenerateRequest) -> dict:
     n_groups = len(backends)
     results = []
     errors = []
+    base_payload = body.model_dump()
     
     async def call_one(port: int, group_id: int):
-        payload = body.model_dump()
-        payload["group_id"] = group_id
-        payload["n_groups"] = n_groups
-        try:
-            r = await call_backend(port, "POST", "/api/v1/pow/init/generate", payload)
-            return port, r.status_code, r.json() if r.status_code == 200 else r.text
-        except Exception as e:
-            return port, 500, str(e)
+        payload = {**base_payload, "group_id": group_id, "n_groups": n_groups}
+        r = await call_backend(port, "POST", "/api/v1/pow/init/generate", payload)
+        return r.status_code, r.json() if r.status_code == 200 else r.text
     
     tasks = [call_one(port, i) for i, port in enumerate(backends)]
-    for coro in asyncio.as_completed(tasks):
-        port, status, data = await coro
+    outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+    for port, outcome in zip(backends, outcomes):
+        if isinstance(outcome, Exception):
+            errors.append({"port": port, "error": str(outcome)})
+            continue
+        status, data = outcome
         if status == 200:
             results.append({"port": port, "status": "OK"})
         else:
@@ -124,15 +124,16 @@ async def stop() -> dict:
     errors = []
     
     async def call_one(port: int):
-        try:
-            r = await call_backend(port, "POST", "/api/v1/pow/stop", {})
-            return port, r.status_code, r.json() if r.status_code == 200 else r.text
-        except Exception as e:
-            return port, 500, str(e)
+        r = await call_backend(port, "POST", "/api/v1/pow/stop", {})
+        return r.status_code, r.json() if r.status_code == 200 else r.text
     
     tasks = [call_one(port) for port in backends]
-    for coro in asyncio.as_completed(tasks):
-        port, status, data = await coro
+    outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+    for port, outcome in zip(backends, outcomes):
+        if isinstance(outcome, Exception):
+            errors.append({"port": port, "error": str(outcome)})
+            continue
+        status, data = outcome
         if status == 200:
             results.append({"port": port, "status": "stopped"})
         else:
@@ -145,9 +146,27 @@ async def stop() -> dict:
     }
 
 
+def _aggregate_status(backend_statuses: List[dict]) -> str:
+    """Combine per-backend PoC statuses into one aggregate status."""
+    statuses = [b.get("status", "UNKNOWN") for b in backend_statuses]
+    if all(s == "GENERATING" for s in statuses):
+        return "GENERATING"
+    elif any(s == "GENERATING" for s in statuses):
+        return "MIXED"
+    elif all(s == "IDLE" for s in statuses):
+        return "IDLE"
+    return "MIXED"
+
+
 @router.get("/status")
-async def status() -> dict:
-    """Aggregate /status from all healthy backends."""
+async def status(quick: bool = False) -> dict:
+    """Aggregate /status from all healthy backends.
+
+    With quick=true, returns as soon as any backend reports GENERATING and
+    cancels the outstanding calls; the response then only lists the backends
+    that answered so far, carries "partial": true and has status
+    "ANY_GENERATING", since the unanswered backends may or may not be generating.
+    """
     backends = get_healthy_backends()
     if not backends:
         return {"status": "NO_BACKENDS", "backends": []}
@@ -155,33 +174,41 @@ async def status() -> dict:
     backend_statuses = []
     
     async def call_one(port: int):
-        try:
-            r = await call_backend(port, "GET", "/api/v1/pow/status")
-            if r.status_code == 200:
-                data = r.json()
-                return port, data
-            return port, {"status": "ERROR", "detail": r.text}
-        except Exception as e:
-            return port, {"status": "ERROR", "detail": str(e)}
+        r = await call_backend(port, "GET", "/api/v1/pow/status")
+        if r.status_code == 200:
+            return r.json()
+        return {"status": "ERROR", "detail": r.text}
     
-    tasks = [call_one(port) for port in backends]
-    for coro in asyncio.as_completed(tasks):
-        port, data = await coro
-        backend_statuses.append({"port": port, **data})
-    
-    # Determine aggregate status
-    statuses = [b.get("status", "UNKNOWN") for b in backend_statuses]
-    if all(s == "GENERATING" for s in statuses):
-        agg_status = "GENERATING"
-    elif any(s == "GENERATING" for s in statuses):
-        agg_status = "MIXED"
-    elif all(s == "IDLE" for s in statuses):
-        agg_status = "IDLE"
+    if quick:
+        task_ports = {asyncio.create_task(call_one(port)): port for port in backends}
+        pending = set(task_ports)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    outcome = {"status": "ERROR", "detail": str(task.exception())}
+                else:
+                    outcome = task.result()
+                backend_statuses.append({"port": task_ports[task], **outcome})
+            
+            if pending and any(b.get("status") == "GENERATING" for b in backend_statuses):
+                for task in pending:
+                    task.cancel()
+                return {
+                    "status": "ANY_GENERATING",
+                    "backends": backend_statuses,
+                    "partial": True,
+                }
     else:
-        agg_status = "MIXED"
+        tasks = [call_one(port) for port in backends]
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+        for port, outcome in zip(backends, outcomes):
+            if isinstance(outcome, Exception):
+                outcome = {"status": "ERROR", "detail": str(outcome)}
+            backend_statuses.append({"port": port, **outcome})
     
     return {
-        "status": agg_status,
+        "status": _aggregate_status(backend_statuses),
         "backends": backend_statuses,
     }
 
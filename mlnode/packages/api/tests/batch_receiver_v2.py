@@ -1,7 +1,22 @@
 """Batch receiver for PoC v2 artifact-based callbacks."""
-from typing import List, Optional
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+import os
+from collections import deque
+from typing import AsyncIterator, Deque, List, Optional
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
+
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    import json
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
 
 
 class ArtifactModel(BaseModel):
@@ -40,47 +55,71 @@ class ValidationResult(BaseModel):
     fraud_detected: bool
 
 
+# Max entries kept per store; oldest are dropped first so long soak runs stay bounded
+RECEIVER_CAP = int(os.environ.get("RECEIVER_CAP", 100_000))
+
 app = FastAPI(title="PoC v2 Batch Receiver")
-app.state.generated_batches: List[GeneratedBatch] = []
-app.state.validation_results: List[ValidationResult] = []
+# Stored as plain dicts (model_dump) rather than Pydantic instances
+app.state.generated_batches: Deque[dict] = deque(maxlen=RECEIVER_CAP)
+app.state.validation_results: Deque[dict] = deque(maxlen=RECEIVER_CAP)
+
+
+async def _parse_body(request: Request, model: type[BaseModel]) -> BaseModel:
+    """Validate the raw request body straight from JSON bytes (pydantic-core, no intermediate dict)."""
+    try:
+        return model.model_validate_json(await request.body())
+    except ValidationError as e:
+        # Match FastAPI's own body validation errors, whose loc starts with "body"
+        raise RequestValidationError(
+            [{**err, "loc": ("body", *err["loc"])} for err in e.errors(include_url=False)]
+        )
 
 
 @app.post("/generated")
-async def receive_generated(batch: GeneratedBatch):
+async def receive_generated(request: Request):
     """Receive artifact batch from PoC generation."""
+    batch = await _parse_body(request, GeneratedBatch)
     try:
-        app.state.generated_batches.append(batch)
+        app.state.generated_batches.append(batch.model_dump())
         return {"status": "OK", "artifacts_count": len(batch.artifacts)}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.post("/validated")
-async def receive_validated(result: ValidationResult):
+async def receive_validated(request: Request):
     """Receive validation result from PoC validation."""
+    result = await _parse_body(request, ValidationResult)
     try:
-        app.state.validation_results.append(result)
+        app.state.validation_results.append(result.model_dump())
         return {"status": "OK"}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+def _stream_items(key: str, items: Deque[dict]) -> StreamingResponse:
+    """Stream {"count": N, key: [...]} one serialized item at a time."""
+    snapshot = list(items)  # decouple from appends racing with the response
+
+    async def body() -> AsyncIterator[bytes]:
+        yield b'{"count":' + str(len(snapshot)).encode() + b',"' + key.encode() + b'":['
+        for i, item in enumerate(snapshot):
+            yield (b"," if i else b"") + _dumps(item)
+        yield b"]}"
+
+    return StreamingResponse(body(), media_type="application/json")
+
+
 @app.get("/generated")
 async def get_generated():
     """Get all received artifact batches."""
-    return {
-        "count": len(app.state.generated_batches),
-        "batches": [b.model_dump() for b in app.state.generated_batches]
-    }
+    return _stream_items("batches", app.state.generated_batches)
 
 
 @app.get("/validated")
 async def get_validated():
     """Get all received validation results."""
-    return {
-        "count": len(app.state.validation_results),
-        "results": [r.model_dump() for r in app.state.validation_results]
-    }
+    return _stream_items("results", app.state.validation_results)
 
 
 @app.post("/clear")
@@ -11,10 +11,9 @@ Test flow:
 """
 import os
 import time
-import base64
 import hashlib
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 import pytest
 import requests
@@ -23,12 +22,41 @@ import numpy as np
 from api.inference.client import InferenceClient
 from common.wait import wait_for_server
 
+try:
+    import pybase64 as b64  # SIMD codec, drop-in for the stdlib API
+except ImportError:
+    import base64 as b64
+
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    _loads = orjson.loads
+except ImportError:
+    import json
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    _loads = json.loads
+
 
 # Test configuration
 GENERATION_WAIT_TIMEOUT = 60  # seconds to wait for artifacts
 GENERATION_POLL_INTERVAL = 2  # seconds between polls
 STOP_WAIT_TIME = 5  # seconds to wait after stop to verify no callbacks
 K_DIM = 12  # expected vector dimensions
+# Artifact vectors on the wire are fp16 little-endian. On little-endian hosts
+# NumPy treats this as the native float16 dtype, so no byte swapping happens.
+VECTOR_DTYPE = np.dtype('<f2')
+MODEL_NAME = "Qwen/Qwen3-0.6B"
+# Deploy vLLM once per session instead of once per test (set REUSE_VLLM=1)
+REUSE_VLLM = os.getenv("REUSE_VLLM") == "1"
+
+# Shared session so polling reuses one keep-alive connection
+_session = requests.Session()
 
 
 @pytest.fixture(scope="session")
@@ -61,6 +89,22 @@ def inference_client(server_url: str) -> InferenceClient:
     return InferenceClient(server_url)
 
 
+@pytest.fixture(scope="session")
+def vllm_backend(server_url: str, vllm_url: str, inference_client: InferenceClient):
+    """Deploy the model once for the whole session when REUSE_VLLM=1.
+
+    Yields True if the shared deployment is active; otherwise yields False and
+    each test deploys and tears down its own model.
+    """
+    if not REUSE_VLLM:
+        yield False
+        return
+    requests.post(f"{server_url}/api/v1/stop")
+    deploy_model(inference_client, vllm_url)
+    yield True
+    inference_client.inference_down()
+
+
 @pytest.fixture
 def session_ids() -> Dict[str, Any]:
     """Generate unique identifiers for test session."""
@@ -72,37 +116,103 @@ def session_ids() -> Dict[str, Any]:
     }
 
 
-def decode_artifact_vector(vector_b64: str, k_dim: int = K_DIM) -> np.ndarray:
-    """Decode base64 fp16 little-endian vector and validate."""
-    data = base64.b64decode(vector_b64)
-    vec = np.frombuffer(data, dtype='<f2')  # little-endian float16
-    assert len(vec) == k_dim, f"Expected {k_dim} dims, got {len(vec)}"
-    assert not np.any(np.isnan(vec)), "Vector contains NaN"
-    assert not np.any(np.isinf(vec)), "Vector contains Inf"
-    return vec.astype(np.float32)
+def decode_artifact_vectors_batch(vector_b64_list: List[str], k_dim: int = K_DIM) -> np.ndarray:
+    """Decode many base64 fp16 little-endian vectors into one (N, k_dim) float32 matrix and validate."""
+    chunks = [b64.b64decode(s) for s in vector_b64_list]
+    bad = [i for i, c in enumerate(chunks) if len(c) != 2 * k_dim]
+    assert not bad, f"Expected {k_dim} dims, got {[len(chunks[i]) // 2 for i in bad]} at {bad}"
+    vecs = np.frombuffer(b"".join(chunks), dtype=VECTOR_DTYPE).reshape(len(chunks), k_dim)
+    assert np.isfinite(vecs).all(), "Vectors contain NaN/Inf"
+    return vecs.astype(np.float32)
 
 
 def encode_vector(vec: np.ndarray) -> str:
     """Encode numpy vector to base64 fp16 little-endian."""
-    f16 = vec.astype(np.float16)
-    return base64.b64encode(f16.tobytes()).decode('ascii')
+    f16 = vec.astype(VECTOR_DTYPE)
+    return b64.b64encode(np.ascontiguousarray(f16).tobytes()).decode('ascii')
 
 
-def corrupt_vector_large(vector_b64: str, k_dim: int = K_DIM) -> str:
-    """Corrupt a vector with large noise (L2 >> 0.02)."""
-    vec = decode_artifact_vector(vector_b64, k_dim)
-    vec += np.random.normal(0, 0.5, k_dim).astype(np.float32)  # Large noise
+def corrupt_vector_large(vec: np.ndarray, k_dim: int = K_DIM, noise: Optional[np.ndarray] = None) -> str:
+    """Corrupt a decoded vector with large noise (L2 >> 0.02).
+
+    Pass a pre-drawn noise row to avoid one RNG call per vector.
+    """
+    vec = vec.astype(np.float32)  # astype copies, the caller's row is untouched
+    if noise is None:
+        noise = np.random.normal(0, 0.5, k_dim).astype(np.float32)
+    vec += noise  # Large noise
     return encode_vector(vec)
 
 
-def perturb_vector_small(vector_b64: str, k_dim: int = K_DIM, max_l2: float = 1e-3) -> str:
-    """Perturb vector with tiny noise (L2 ~ 1e-3, well under threshold)."""
-    vec = decode_artifact_vector(vector_b64, k_dim)
-    # Random direction, scaled to target L2 norm
-    noise = np.random.randn(k_dim).astype(np.float32)
-    noise = noise / np.linalg.norm(noise) * max_l2
-    vec += noise
-    return encode_vector(vec)
+def encode_vectors_batch(vecs: np.ndarray) -> List[str]:
+    """Encode each row of an (N, k_dim) matrix to base64 fp16 little-endian."""
+    f16 = np.ascontiguousarray(vecs.astype(VECTOR_DTYPE))
+    return [b64.b64encode(row.tobytes()).decode('ascii') for row in f16]
+
+
+def perturb_vectors_small_batch(
+    vecs: np.ndarray,
+    max_l2: float = 1e-3,
+    noise: Optional[np.ndarray] = None,
+) -> List[str]:
+    """Perturb every decoded vector with tiny noise of L2 norm max_l2 (~1e-3, well under threshold).
+
+    vecs is an (N, k_dim) float32 matrix and is left untouched. noise is an optional
+    pre-drawn (N, k_dim) float32 matrix of random directions; it is rescaled in place.
+    """
+    # Random direction per row, scaled to target L2 norm
+    if noise is None:
+        noise = np.random.randn(*vecs.shape).astype(np.float32)
+    sq_norms = np.einsum('ij,ij->i', noise, noise)  # row-wise squared L2 in one pass
+    noise *= (max_l2 / np.sqrt(sq_norms))[:, None]
+    return encode_vectors_batch(vecs + noise)
+
+
+def deploy_model(inference_client: InferenceClient, vllm_url: str):
+    """Deploy MODEL_NAME with PoC enabled and wait for vLLM to serve it."""
+    inference_client.inference_setup(
+        model=MODEL_NAME,
+        dtype="bfloat16",
+        additional_args=[
+            "--max-model-len", "512",
+            "--gpu-memory-utilization", "0.8",
+        ]
+    )
+    wait_for_server(f"{vllm_url}/health", timeout=300)
+    wait_for_server(f"{vllm_url}/v1/models", timeout=60)
+
+
+def setup_model(server_url: str, vllm_url: str, inference_client: InferenceClient, shared: bool):
+    """Reset services before a test, deploying the model unless it is shared."""
+    if shared:
+        # Keep vLLM up; only stop any generation left over from a previous test
+        requests.post(f"{server_url}/api/v1/inference/pow/stop")
+        return
+    requests.post(f"{server_url}/api/v1/stop")
+    deploy_model(inference_client, vllm_url)
+
+
+def teardown_model(inference_client: InferenceClient, shared: bool):
+    """Tear down the model unless it is shared across the session."""
+    if not shared:
+        inference_client.inference_down()
+
+
+def post_json(url: str, payload: Dict[str, Any]) -> requests.Response:
+    """POST a pre-serialized JSON payload on the shared session."""
+    return _session.post(url, data=_dumps(payload), headers={"Content-Type": "application/json"})
+
+
+def response_json(resp: requests.Response) -> Any:
+    """Decode a JSON response body."""
+    return _loads(resp.content)
+
+
+def _check(resp: requests.Response) -> requests.Response:
+    """raise_for_status, skipped outright on the common success path."""
+    if resp.status_code >= 400:
+        resp.raise_for_status()
+    return resp
 
 
 def clear_batch_receiver(batch_receiver_url: str):
@@ -113,9 +223,8 @@ def clear_batch_receiver(batch_receiver_url: str):
 
 def get_generated_batches(batch_receiver_url: str) -> List[Dict]:
     """Get all received artifact batches from batch receiver."""
-    resp = requests.get(f"{batch_receiver_url}/generated")
-    resp.raise_for_status()
-    return resp.json().get("batches", [])
+    resp = _check(_session.get(f"{batch_receiver_url}/generated"))
+    return response_json(resp).get("batches", [])
 
 
 def get_all_artifacts(batches: List[Dict]) -> List[Dict]:
@@ -127,16 +236,23 @@ def get_all_artifacts(batches: List[Dict]) -> List[Dict]:
 
 
 def wait_for_artifacts(batch_receiver_url: str, min_count: int = 1, timeout: float = GENERATION_WAIT_TIMEOUT) -> List[Dict]:
-    """Wait for at least min_count artifacts to be received."""
+    """Wait for at least min_count artifacts to be received.
+
+    Polls with exponential backoff starting at 0.2s, capped at GENERATION_POLL_INTERVAL.
+    """
     start = time.time()
+    interval = 0.2
+    last_count = 0
     while time.time() - start < timeout:
         batches = get_generated_batches(batch_receiver_url)
         artifacts = get_all_artifacts(batches)
-        if len(artifacts) >= min_count:
+        last_count = len(artifacts)
+        if last_count >= min_count:
             return artifacts
-        time.sleep(GENERATION_POLL_INTERVAL)
+        time.sleep(interval)
+        interval = min(interval * 1.5, GENERATION_POLL_INTERVAL)
     
-    raise TimeoutError(f"Timeout waiting for {min_count} artifacts (got {len(get_all_artifacts(get_generated_batches(batch_receiver_url)))})")
+    raise TimeoutError(f"Timeout waiting for {min_count} artifacts (got {last_count})")
 
 
 class TestPoCv2E2E:
@@ -148,6 +264,7 @@ class TestPoCv2E2E:
         batch_receiver_url: str,
         vllm_url: str,
         inference_client: InferenceClient,
+        vllm_backend: bool,
         session_ids: Dict[str, Any],
     ):
         """Full E2E test: deploy, generate, validate artifacts, stop."""
@@ -155,24 +272,11 @@ class TestPoCv2E2E:
         # 1. Setup: Clear batch receiver, stop any running services
         print("Step 1: Setup - clearing batch receiver and stopping services")
         clear_batch_receiver(batch_receiver_url)
-        requests.post(f"{server_url}/api/v1/stop")
-        
-        # 2. Deploy model with PoC enabled
-        print("Step 2: Deploying model with PoC enabled")
-        model_name = "Qwen/Qwen3-0.6B"
-        inference_client.inference_setup(
-            model=model_name,
-            dtype="bfloat16",
-            additional_args=[
-                "--max-model-len", "512",
-                "--gpu-memory-utilization", "0.8",
-            ]
-        )
-        
-        # 3. Wait for vLLM to be ready
-        print("Step 3: Waiting for vLLM to be ready")
-        wait_for_server(f"{vllm_url}/health", timeout=300)
-        wait_for_server(f"{vllm_url}/v1/models", timeout=60)
+        
+        # 2-3. Deploy model with PoC enabled and wait for vLLM (skipped if shared)
+        print("Step 2-3: Deploying model with PoC enabled")
+        model_name = MODEL_NAME
+        setup_model(server_url, vllm_url, inference_client, vllm_backend)
         
         # 4. Start artifact generation
         print("Step 4: Starting artifact generation")
@@ -191,9 +295,9 @@ class TestPoCv2E2E:
             "url": batch_receiver_url,
         }
         
-        resp = requests.post(f"{server_url}/api/v1/inference/pow/init/generate", json=init_payload)
+        resp = post_json(f"{server_url}/api/v1/inference/pow/init/generate", init_payload)
         resp.raise_for_status()
-        init_result = resp.json()
+        init_result = response_json(resp)
         assert init_result["status"] == "OK", f"Init failed: {init_result}"
         print(f"Init result: {init_result}")
         
@@ -211,33 +315,32 @@ class TestPoCv2E2E:
         print("Step 7: Parsing and validating artifacts")
         assert len(artifacts) > 1, f"Expected more than 1 artifact, got {len(artifacts)}"
         
-        validated_artifacts = []
-        nonces_seen = set()
-        
-        for artifact in artifacts:
-            nonce = artifact["nonce"]
-            vector_b64 = artifact["vector_b64"]
-            
-            # Decode and validate vector
-            vec = decode_artifact_vector(vector_b64, K_DIM)
-            assert vec.shape == (K_DIM,), f"Wrong shape: {vec.shape}"
-            
-            # Track nonces (should be unique)
-            assert nonce not in nonces_seen, f"Duplicate nonce: {nonce}"
-            nonces_seen.add(nonce)
-            
-            validated_artifacts.append({
-                "nonce": nonce,
-                "vector_b64": vector_b64,
-            })
+        # Decode and validate all vectors at once
+        vector_b64s = [a["vector_b64"] for a in artifacts]
+        vecs = decode_artifact_vectors_batch(vector_b64s, K_DIM)
+        assert vecs.shape == (len(artifacts), K_DIM), f"Wrong shape: {vecs.shape}"
+        
+        # Nonces should be unique
+        nonces = np.fromiter((a["nonce"] for a in artifacts), dtype=np.int64, count=len(artifacts))
+        uniq, counts = np.unique(nonces, return_counts=True)
+        assert len(uniq) == len(nonces), f"Duplicate nonces: {uniq[counts > 1].tolist()}"
+        
+        # Column layout: one int64 nonce field, one base64 string field
+        validated_artifacts = np.empty(len(artifacts), dtype=[("nonce", "i8"), ("vector_b64", "O")])
+        validated_artifacts["nonce"] = nonces
+        validated_artifacts["vector_b64"] = vector_b64s
         
         print(f"Validated {len(validated_artifacts)} artifacts with unique nonces")
         
         # 8. Send validation request (verify our own artifacts - should be honest)
         print("Step 8: Sending validation request")
         # Take a subset for validation
-        validation_subset = validated_artifacts[:min(50, len(validated_artifacts))]
-        nonces_to_validate = [a["nonce"] for a in validation_subset]
+        n_validate = min(50, len(validated_artifacts))
+        nonces_to_validate = validated_artifacts["nonce"][:n_validate].tolist()
+        validation_subset = [
+            {"nonce": nonce, "vector_b64": vector_b64}
+            for nonce, vector_b64 in zip(nonces_to_validate, validated_artifacts["vector_b64"][:n_validate])
+        ]
         
         generate_payload = {
             "block_hash": session_ids["block_hash"],
@@ -263,9 +366,9 @@ class TestPoCv2E2E:
             },
         }
         
-        resp = requests.post(f"{server_url}/api/v1/inference/pow/generate", json=generate_payload)
+        resp = post_json(f"{server_url}/api/v1/inference/pow/generate", generate_payload)
         resp.raise_for_status()
-        validation_result = resp.json()
+        validation_result = response_json(resp)
         print(f"Validation result: {validation_result}")
         
         # 9. Check validation result - honest node should have n_mismatch=0
@@ -296,7 +399,7 @@ class TestPoCv2E2E:
         
         # 11. Cleanup
         print("Step 11: Cleanup")
-        inference_client.inference_down()
+        teardown_model(inference_client, vllm_backend)
         
         print("E2E test completed successfully!")
     
@@ -306,30 +409,22 @@ class TestPoCv2E2E:
         batch_receiver_url: str,
         vllm_url: str,
         inference_client: InferenceClient,
+        vllm_backend: bool,
         session_ids: Dict[str, Any],
     ):
         """Test that /status endpoint reflects correct state transitions."""
         
         # Setup
         clear_batch_receiver(batch_receiver_url)
-        requests.post(f"{server_url}/api/v1/stop")
         
         # Deploy model
-        model_name = "Qwen/Qwen3-0.6B"
-        inference_client.inference_setup(
-            model=model_name,
-            dtype="bfloat16",
-            additional_args=[
-                "--max-model-len", "512",
-                "--gpu-memory-utilization", "0.8",
-            ]
-        )
-        wait_for_server(f"{vllm_url}/health", timeout=300)
+        model_name = MODEL_NAME
+        setup_model(server_url, vllm_url, inference_client, vllm_backend)
         
         # Check initial status (should be IDLE or NO_BACKENDS initially)
         resp = requests.get(f"{server_url}/api/v1/inference/pow/status")
         resp.raise_for_status()
-        status = resp.json()
+        status = response_json(resp)
         print(f"Initial status: {status}")
         
         # Start generation
@@ -343,7 +438,7 @@ class TestPoCv2E2E:
             "params": {"model": model_name, "seq_len": 256, "k_dim": K_DIM},
         }
         
-        resp = requests.post(f"{server_url}/api/v1/inference/pow/init/generate", json=init_payload)
+        resp = post_json(f"{server_url}/api/v1/inference/pow/init/generate", init_payload)
         resp.raise_for_status()
         
         # Wait a moment for generation to start
@@ -352,7 +447,7 @@ class TestPoCv2E2E:
         # Check status during generation
         resp = requests.get(f"{server_url}/api/v1/inference/pow/status")
         resp.raise_for_status()
-        status = resp.json()
+        status = response_json(resp)
         print(f"Status during generation: {status}")
         assert status["status"] in ["GENERATING", "MIXED"], f"Expected GENERATING, got: {status}"
         
@@ -366,12 +461,12 @@ class TestPoCv2E2E:
         # Check status after stop
         resp = requests.get(f"{server_url}/api/v1/inference/pow/status")
         resp.raise_for_status()
-        status = resp.json()
+        status = response_json(resp)
         print(f"Status after stop: {status}")
         assert status["status"] in ["IDLE", "STOPPED", "MIXED"], f"Expected IDLE/STOPPED, got: {status}"
         
         # Cleanup
-        inference_client.inference_down()
+        teardown_model(inference_client, vllm_backend)
 
 
 class TestPoCv2FraudDetection:
@@ -384,11 +479,11 @@ class TestPoCv2FraudDetection:
         batch_receiver_url: str,
         vllm_url: str,
         inference_client: InferenceClient,
+        vllm_backend: bool,
     ):
         """Setup model and generate artifacts once for all fraud tests."""
         # Setup
         clear_batch_receiver(batch_receiver_url)
-        requests.post(f"{server_url}/api/v1/stop")
         
         # Generate unique session ids for this test class
         date_str = datetime.now().strftime('%Y-%m-%d_%H-%M-%S-%f')
@@ -399,17 +494,8 @@ class TestPoCv2FraudDetection:
         }
         
         # Deploy model
-        model_name = "Qwen/Qwen3-0.6B"
-        inference_client.inference_setup(
-            model=model_name,
-            dtype="bfloat16",
-            additional_args=[
-                "--max-model-len", "512",
-                "--gpu-memory-utilization", "0.8",
-            ]
-        )
-        wait_for_server(f"{vllm_url}/health", timeout=300)
-        wait_for_server(f"{vllm_url}/v1/models", timeout=60)
+        model_name = MODEL_NAME
+        setup_model(server_url, vllm_url, inference_client, vllm_backend)
         
         # Start generation
         init_payload = {
@@ -422,7 +508,7 @@ class TestPoCv2FraudDetection:
             "params": {"model": model_name, "seq_len": 256, "k_dim": K_DIM},
             "url": batch_receiver_url,
         }
-        resp = requests.post(f"{server_url}/api/v1/inference/pow/init/generate", json=init_payload)
+        resp = post_json(f"{server_url}/api/v1/inference/pow/init/generate", init_payload)
         resp.raise_for_status()
         
         # Wait for artifacts
@@ -431,23 +517,44 @@ class TestPoCv2FraudDetection:
         # Stop generation
         requests.post(f"{server_url}/api/v1/inference/pow/stop")
         
+        # Static fields shared by every validation request; tests merge in the rest
+        payload_template = {
+            "block_hash": session_ids["block_hash"],
+            "block_height": session_ids["block_height"],
+            "public_key": session_ids["public_key"],
+            "node_id": 0,
+            "node_count": 1,
+            "params": {"model": model_name, "seq_len": 256, "k_dim": K_DIM},
+            "batch_size": 32,
+            "wait": True,
+            "stat_test": {"dist_threshold": 0.02, "p_mismatch": 0.001, "fraud_threshold": 0.01},
+        }
+        
+        artifacts = artifacts[:50]  # Use first 50 for validation
+        
         # Return context for tests
         yield {
             "server_url": server_url,
             "model_name": model_name,
             "session_ids": session_ids,
-            "artifacts": artifacts[:50],  # Use first 50 for validation
+            "payload_template": payload_template,
+            "artifacts": artifacts,
+            # Decoded once here and shared read-only by the vector-tampering tests
+            "vecs": decode_artifact_vectors_batch([a["vector_b64"] for a in artifacts], K_DIM),
         }
         
         # Cleanup
-        inference_client.inference_down()
+        teardown_model(inference_client, vllm_backend)
+    
+    @pytest.fixture(scope="class")
+    def noise_buffer(self, model_and_artifacts: Dict[str, Any]) -> np.ndarray:
+        """float32 (N, K_DIM) scratch buffer that tests refill with rng.standard_normal(out=...)."""
+        return np.empty((len(model_and_artifacts["artifacts"]), K_DIM), dtype=np.float32)
     
     def test_fraud_wrong_pubkey(self, model_and_artifacts: Dict[str, Any]):
         """Test: same artifacts but different public_key should detect fraud."""
         ctx = model_and_artifacts
         server_url = ctx["server_url"]
-        model_name = ctx["model_name"]
-        session_ids = ctx["session_ids"]
         artifacts = ctx["artifacts"]
         
         # Prepare validation with WRONG public_key
@@ -456,22 +563,15 @@ class TestPoCv2FraudDetection:
         validation_artifacts = [{"nonce": a["nonce"], "vector_b64": a["vector_b64"]} for a in artifacts]
         
         payload = {
-            "block_hash": session_ids["block_hash"],
-            "block_height": session_ids["block_height"],
+            **ctx["payload_template"],
             "public_key": wrong_pubkey,  # Different from original!
-            "node_id": 0,
-            "node_count": 1,
             "nonces": nonces,
-            "params": {"model": model_name, "seq_len": 256, "k_dim": K_DIM},
-            "batch_size": 32,
-            "wait": True,
             "validation": {"artifacts": validation_artifacts},
-            "stat_test": {"dist_threshold": 0.02, "p_mismatch": 0.001, "fraud_threshold": 0.01},
         }
         
-        resp = requests.post(f"{server_url}/api/v1/inference/pow/generate", json=payload)
+        resp = post_json(f"{server_url}/api/v1/inference/pow/generate", payload)
         resp.raise_for_status()
-        result = resp.json()
+        result = response_json(resp)
         
         print(f"Wrong pubkey result: {result}")
         
@@ -484,8 +584,6 @@ class TestPoCv2FraudDetection:
         """Test: artifacts with mismatched nonces should return 400."""
         ctx = model_and_artifacts
         server_url = ctx["server_url"]
-        model_name = ctx["model_name"]
-        session_ids = ctx["session_ids"]
         artifacts = ctx["artifacts"]
         
         # Use artifacts but provide DIFFERENT nonces list
@@ -493,44 +591,38 @@ class TestPoCv2FraudDetection:
         validation_artifacts = [{"nonce": a["nonce"], "vector_b64": a["vector_b64"]} for a in artifacts]
         
         payload = {
-            "block_hash": session_ids["block_hash"],
-            "block_height": session_ids["block_height"],
-            "public_key": session_ids["public_key"],
-            "node_id": 0,
-            "node_count": 1,
+            **ctx["payload_template"],
             "nonces": wrong_nonces,  # Mismatched!
-            "params": {"model": model_name, "seq_len": 256, "k_dim": K_DIM},
-            "batch_size": 32,
-            "wait": True,
             "validation": {"artifacts": validation_artifacts},
-            "stat_test": {"dist_threshold": 0.02, "p_mismatch": 0.001, "fraud_threshold": 0.01},
         }
         
-        resp = requests.post(f"{server_url}/api/v1/inference/pow/generate", json=payload)
+        resp = post_json(f"{server_url}/api/v1/inference/pow/generate", payload)
         
         print(f"Wrong nonces response: status={resp.status_code}, body={resp.text[:500]}")
         
         # Expect 400 Bad Request (nonces must match artifacts)
         assert resp.status_code == 400, f"Expected 400 for mismatched nonces, got {resp.status_code}"
     
-    def test_fraud_modified_vectors(self, model_and_artifacts: Dict[str, Any]):
+    def test_fraud_modified_vectors(self, model_and_artifacts: Dict[str, Any], noise_buffer: np.ndarray):
         """Test: 20% corrupted vectors should detect fraud."""
         ctx = model_and_artifacts
         server_url = ctx["server_url"]
-        model_name = ctx["model_name"]
-        session_ids = ctx["session_ids"]
         artifacts = ctx["artifacts"]
         
         # Corrupt 20% of vectors with large noise
-        np.random.seed(42)  # Reproducible
+        rng = np.random.default_rng(42)  # Reproducible
         n_to_corrupt = max(1, len(artifacts) // 5)  # 20%
-        corrupt_indices = set(np.random.choice(len(artifacts), n_to_corrupt, replace=False))
+        corrupt_indices = set(rng.choice(len(artifacts), n_to_corrupt, replace=False).tolist())
+        # All noise drawn up front in one call, straight into the shared float32 buffer
+        noise = rng.standard_normal(out=noise_buffer, dtype=np.float32)
+        noise *= 0.5
+        vecs = ctx["vecs"]  # Only the corrupted rows get re-encoded
         
         validation_artifacts = []
         for i, a in enumerate(artifacts):
             if i in corrupt_indices:
                 # Corrupt this vector
-                corrupted_b64 = corrupt_vector_large(a["vector_b64"], K_DIM)
+                corrupted_b64 = corrupt_vector_large(vecs[i], K_DIM, noise=noise[i])
                 validation_artifacts.append({"nonce": a["nonce"], "vector_b64": corrupted_b64})
             else:
                 validation_artifacts.append({"nonce": a["nonce"], "vector_b64": a["vector_b64"]})
@@ -538,22 +630,14 @@ class TestPoCv2FraudDetection:
         nonces = [a["nonce"] for a in artifacts]
         
         payload = {
-            "block_hash": session_ids["block_hash"],
-            "block_height": session_ids["block_height"],
-            "public_key": session_ids["public_key"],
-            "node_id": 0,
-            "node_count": 1,
+            **ctx["payload_template"],
             "nonces": nonces,
-            "params": {"model": model_name, "seq_len": 256, "k_dim": K_DIM},
-            "batch_size": 32,
-            "wait": True,
             "validation": {"artifacts": validation_artifacts},
-            "stat_test": {"dist_threshold": 0.02, "p_mismatch": 0.001, "fraud_threshold": 0.01},
         }
         
-        resp = requests.post(f"{server_url}/api/v1/inference/pow/generate", json=payload)
+        resp = post_json(f"{server_url}/api/v1/inference/pow/generate", payload)
         resp.raise_for_status()
-        result = resp.json()
+        result = response_json(resp)
         
         print(f"Modified vectors result: {result}")
         print(f"Corrupted {n_to_corrupt} vectors out of {len(artifacts)}")
@@ -563,40 +647,32 @@ class TestPoCv2FraudDetection:
         assert result["n_mismatch"] >= n_to_corrupt - 2, f"Expected ~{n_to_corrupt} mismatches: {result}"
         assert result["fraud_detected"] == True, f"Expected fraud_detected=True: {result}"
     
-    def test_small_perturbation_passes(self, model_and_artifacts: Dict[str, Any]):
+    def test_small_perturbation_passes(self, model_and_artifacts: Dict[str, Any], noise_buffer: np.ndarray):
         """Test: tiny L2 perturbation (~1e-3) should still pass as honest."""
         ctx = model_and_artifacts
         server_url = ctx["server_url"]
-        model_name = ctx["model_name"]
-        session_ids = ctx["session_ids"]
         artifacts = ctx["artifacts"]
         
         # Perturb ALL vectors with tiny noise (L2 ~ 1e-3, well under 0.02 threshold)
-        np.random.seed(123)  # Reproducible
-        validation_artifacts = []
-        for a in artifacts:
-            perturbed_b64 = perturb_vector_small(a["vector_b64"], K_DIM, max_l2=1e-3)
-            validation_artifacts.append({"nonce": a["nonce"], "vector_b64": perturbed_b64})
+        rng = np.random.default_rng(123)  # Reproducible
+        noise = rng.standard_normal(out=noise_buffer, dtype=np.float32)
+        perturbed = perturb_vectors_small_batch(ctx["vecs"], max_l2=1e-3, noise=noise)
+        validation_artifacts = [
+            {"nonce": a["nonce"], "vector_b64": perturbed_b64}
+            for a, perturbed_b64 in zip(artifacts, perturbed)
+        ]
         
         nonces = [a["nonce"] for a in artifacts]
         
         payload = {
-            "block_hash": session_ids["block_hash"],
-            "block_height": session_ids["block_height"],
-            "public_key": session_ids["public_key"],
-            "node_id": 0,
-            "node_count": 1,
+            **ctx["payload_template"],
             "nonces": nonces,
-            "params": {"model": model_name, "seq_len": 256, "k_dim": K_DIM},
-            "batch_size": 32,
-            "wait": True,
             "validation": {"artifacts": validation_artifacts},
-            "stat_test": {"dist_threshold": 0.02, "p_mismatch": 0.001, "fraud_threshold": 0.01},
         }
         
-        resp = requests.post(f"{server_url}/api/v1/inference/pow/generate", json=payload)
+        resp = post_json(f"{server_url}/api/v1/inference/pow/generate", payload)
         resp.raise_for_status()
-        result = resp.json()
+        result = response_json(resp)
         
         print(f"Small perturbation result: {result}")
         
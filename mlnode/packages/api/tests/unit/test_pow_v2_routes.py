@@ -1,23 +1,43 @@
 """Integration tests for PoC v2 routes (fan-out, status-aware LB, composite request_id)."""
+import asyncio
+from dataclasses import dataclass
 import pytest
-from unittest.mock import patch, MagicMock, AsyncMock
+from unittest.mock import patch, AsyncMock
 from fastapi.testclient import TestClient
 
 from api.app import app
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def client():
+    # Stateless across tests: backend state is patched per test on api.proxy
     return TestClient(app)
 
 
-def make_mock_response(status_code: int, json_data: dict):
-    """Create a mock httpx response."""
-    mock = MagicMock()
-    mock.status_code = status_code
-    mock.json.return_value = json_data
-    mock.text = str(json_data)
-    return mock
+@dataclass(frozen=True, slots=True)
+class FakeResponse:
+    """Minimal stand-in for httpx.Response: status_code, json() and text."""
+    status_code: int
+    json_data: dict
+
+    def json(self):
+        return self.json_data
+
+    @property
+    def text(self) -> str:
+        return str(self.json_data)
+
+
+def make_mock_response(status_code: int, json_data: dict) -> FakeResponse:
+    """Create a fake httpx response."""
+    return FakeResponse(status_code, json_data)
+
+
+# Constant backend responses shared across mocks (the routes never mutate them)
+OK_GENERATING = make_mock_response(200, {"status": "OK", "pow_status": {"status": "GENERATING"}})
+OK_STOPPED = make_mock_response(200, {"status": "OK", "pow_status": {"status": "STOPPED"}})
+STATUS_GENERATING = make_mock_response(200, {"status": "GENERATING", "stats": {"total_processed": 100}})
+STATUS_IDLE = make_mock_response(200, {"status": "IDLE"})
 
 
 class TestInitGenerateFanout:
@@ -33,7 +53,7 @@ class TestInitGenerateFanout:
         
         async def mock_post(url, json=None, timeout=None):
             captured_calls.append({"url": url, "json": json})
-            return make_mock_response(200, {"status": "OK", "pow_status": {"status": "GENERATING"}})
+            return OK_GENERATING
         
         with patch('api.proxy.vllm_client') as mock_client:
             mock_client.post = AsyncMock(side_effect=mock_post)
@@ -260,7 +280,7 @@ class TestStopFanout:
         
         async def mock_post(url, json=None, timeout=None):
             captured_urls.append(url)
-            return make_mock_response(200, {"status": "OK", "pow_status": {"status": "STOPPED"}})
+            return OK_STOPPED
         
         with patch('api.proxy.vllm_client') as mock_client:
             mock_client.post = AsyncMock(side_effect=mock_post)
@@ -276,6 +296,27 @@ class TestStopFanout:
             assert len(captured_urls) == 2
             ports_called = {"5001" in u or "5002" in u for u in captured_urls}
             assert True in ports_called
+    
+    @patch('api.proxy.vllm_backend_ports', [5001, 5002])
+    @patch('api.proxy.vllm_healthy', {5001: True, 5002: True})
+    @patch('api.proxy.vllm_counts', {5001: 0, 5002: 0})
+    @patch('api.proxy.poc_status_by_port', {5001: "GENERATING", 5002: "GENERATING"})
+    def test_stop_reports_backend_exception(self, client):
+        """Test /stop maps a backend exception to an error entry for that port."""
+        async def mock_post(url, json=None, timeout=None):
+            if "5002" in url:
+                raise ConnectionError("backend unreachable")
+            return OK_STOPPED
+        
+        with patch('api.proxy.vllm_client') as mock_client:
+            mock_client.post = AsyncMock(side_effect=mock_post)
+            
+            response = client.post("/api/v1/inference/pow/stop")
+            
+            assert response.status_code == 200
+            data = response.json()
+            assert data["results"] == [{"port": 5001, "status": "stopped"}]
+            assert data["errors"] == [{"port": 5002, "error": "backend unreachable"}]
 
 
 class TestStatusAggregation:
@@ -292,9 +333,9 @@ class TestStatusAggregation:
         async def mock_get(url, timeout=None):
             call_count[0] += 1
             if "5001" in url:
-                return make_mock_response(200, {"status": "GENERATING", "stats": {"total_processed": 100}})
+                return STATUS_GENERATING
             else:
-                return make_mock_response(200, {"status": "IDLE"})
+                return STATUS_IDLE
         
         with patch('api.proxy.vllm_client') as mock_client:
             mock_client.get = AsyncMock(side_effect=mock_get)
@@ -313,7 +354,7 @@ class TestStatusAggregation:
     def test_status_all_generating(self, client):
         """Test /status returns GENERATING when all backends are generating."""
         async def mock_get(url, timeout=None):
-            return make_mock_response(200, {"status": "GENERATING", "stats": {"total_processed": 100}})
+            return STATUS_GENERATING
         
         with patch('api.proxy.vllm_client') as mock_client:
             mock_client.get = AsyncMock(side_effect=mock_get)
@@ -323,3 +364,33 @@ class TestStatusAggregation:
             assert response.status_code == 200
             data = response.json()
             assert data["status"] == "GENERATING"
+    
+    @patch('api.proxy.vllm_backend_ports', [5001, 5002])
+    @patch('api.proxy.vllm_healthy', {5001: True, 5002: True})
+    @patch('api.proxy.vllm_counts', {5001: 0, 5002: 0})
+    @patch('api.proxy.poc_status_by_port', {5001: "GENERATING", 5002: "IDLE"})
+    def test_status_quick_returns_on_first_generating(self, client):
+        """Test /status?quick=true returns once a backend is GENERATING without waiting for the rest."""
+        slow_cancelled = []
+        
+        async def mock_get(url, timeout=None):
+            if "5002" in url:
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    slow_cancelled.append(url)
+                    raise
+                return STATUS_IDLE
+            return STATUS_GENERATING
+        
+        with patch('api.proxy.vllm_client') as mock_client:
+            mock_client.get = AsyncMock(side_effect=mock_get)
+            
+            response = client.get("/api/v1/inference/pow/status?quick=true")
+            
+            assert response.status_code == 200
+            data = response.json()
+            assert data["status"] == "ANY_GENERATING"
+            assert data["partial"] is True
+            assert [b["port"] for b in data["backends"]] == [5001]
+            assert len(slow_cancelled) == 1
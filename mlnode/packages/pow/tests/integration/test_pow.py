@@ -12,6 +12,27 @@ from pow.compute.compute import ProofBatch
 from pow.data import ValidatedBatch
 from pow.models.utils import PARAMS_V1
 
+POLL_INITIAL_DELAY = 0.025  # seconds; doubled after every miss
+POLL_MAX_DELAY = 1.0
+
+# Startup probes and batch-receiver reads share one keep-alive connection
+_session = requests.Session()
+
+
+def wait_until(fn, timeout=None, initial=POLL_INITIAL_DELAY, max_delay=POLL_MAX_DELAY):
+    """Call fn until it returns something truthy, backing off exponentially.
+
+    Returns the last result of fn, which is falsy if timeout ran out first.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    delay = initial
+    while True:
+        result = fn()
+        if result or (deadline is not None and time.monotonic() >= deadline):
+            return result
+        sleep(delay)
+        delay = min(delay * 2, max_delay)
+
 @pytest.fixture(scope="session")
 def server_urls():
     batch_receiver_url = os.getenv("BATCH_RECIEVER_URL")
@@ -22,14 +43,13 @@ def server_urls():
         raise ValueError("SERVER_URL is not set")
 
     def wait_for_server(url):
-        while True:
+        def is_up():
             try:
-                response = requests.get(url)
-                if response.status_code == 404 or response.ok:
-                    break
+                response = _session.get(url)
+                return response.status_code == 404 or response.ok
             except requests.exceptions.RequestException:
-                pass
-            sleep(1)
+                return False
+        wait_until(is_up)
 
     wait_for_server(batch_receiver_url)
     wait_for_server(server_url)
@@ -45,8 +65,19 @@ def model_params():
     return PARAMS_V1
 
 @pytest.fixture(scope="session")
-def r_target(model_params):
-    return estimate_R_from_experiment(n=model_params.vocab_size, P=0.001, num_samples=10000)
+def r_target(request, model_params):
+    # The 10k-sample simulation is reused across runs via the pytest cache,
+    # which is absent under -p no:cacheprovider
+    n, P, num_samples = model_params.vocab_size, 0.001, 10000
+    cache = getattr(request.config, "cache", None)
+    if cache is None:
+        return float(estimate_R_from_experiment(n=n, P=P, num_samples=num_samples))
+    key = f"pow/r_target/{n}_{P}_{num_samples}"
+    r = cache.get(key, None)
+    if r is None:
+        r = float(estimate_R_from_experiment(n=n, P=P, num_samples=num_samples))
+        cache.set(key, r)
+    return r
 
 @pytest.fixture(scope="session")
 def unique_identifiers():
@@ -76,19 +107,19 @@ def init_generation(client, server_urls, model_params, r_target, unique_identifi
 
 
 def clear_batches(url):
-    response = requests.post(f"{url}/clear_batches")
+    response = _session.post(f"{url}/clear_batches")
     if response.status_code == 200:
         return response.json()
     raise Exception(f"Error: {response.status_code} - {response.text}")
 
 def get_proof_batches(url):
-    response = requests.get(f"{url}/generated")
+    response = _session.get(f"{url}/generated")
     if response.status_code == 200:
         return response.json()["proof_batches"]
     raise Exception(f"Error: {response.status_code} - {response.text}")
 
 def get_val_proof_batches(url):
-    response = requests.get(f"{url}/validated")
+    response = _session.get(f"{url}/validated")
     if response.status_code == 200:
         return response.json()["validated_batches"]
     raise Exception(f"Error: {response.status_code} - {response.text}")
@@ -104,10 +135,12 @@ def create_correct_batch(pb, n=10000):
     })
 
 def get_incorrect_nonce(pb):
-    for i in range(min(pb.nonces), max(pb.nonces)):
-        if i not in pb.nonces:
+    taken = set(pb.nonces)
+    lo, hi = min(taken), max(taken)
+    for i in range(lo, hi):
+        if i not in taken:
             return i
-    return max(pb.nonces) + 1
+    return hi + 1
 
 def create_incorrect_batch(pb, n, n_invalid):
     incorrect_pb_dict = {
@@ -128,11 +161,7 @@ def create_incorrect_batch(pb, n, n_invalid):
 @pytest.fixture
 def latest_proof_batch(init_generation, server_urls):
     batch_receiver_url, _ = server_urls
-    while True:
-        proof_batches = get_proof_batches(batch_receiver_url)
-        if len(proof_batches) > 0:
-            break
-        sleep(1)
+    proof_batches = wait_until(lambda: get_proof_batches(batch_receiver_url))
     return ProofBatch(**proof_batches[-1])
 
 def test_estimate_r(r_target):
@@ -140,11 +169,7 @@ def test_estimate_r(r_target):
 
 def test_generated_proofs(init_generation, server_urls):
     batch_receiver_url, _ = server_urls
-    while True:
-        proof_batches = get_proof_batches(batch_receiver_url)
-        if len(proof_batches) > 0:
-            break
-        sleep(1)
+    proof_batches = wait_until(lambda: get_proof_batches(batch_receiver_url))
     assert len(proof_batches) > 0
 
 def test_validate_correct_batch(client, server_urls, latest_proof_batch):
@@ -153,14 +178,8 @@ def test_validate_correct_batch(client, server_urls, latest_proof_batch):
     correct_pb = create_correct_batch(latest_proof_batch, n=10)
     client.start_validation()
     client.validate(correct_pb)
-    sleep(5)  # Give time for validation to complete and batch to be sent
     timeout = 60
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        val_proof_batches = get_val_proof_batches(batch_receiver_url)
-        if len(val_proof_batches) > 0:
-            break
-        sleep(1)
+    val_proof_batches = wait_until(lambda: get_val_proof_batches(batch_receiver_url), timeout=timeout)
     assert len(val_proof_batches) > 0, f"No validated batches received after {timeout} seconds"
     vpb = ValidatedBatch(**val_proof_batches[-1])
     assert len(vpb) == 10
@@ -172,25 +191,15 @@ def test_validate_incorrect_batch(client, server_urls):
     
     # Briefly restart generation to get a fresh batch
     client.start_generation()
-    while True:
-        proof_batches = get_proof_batches(batch_receiver_url)
-        if len(proof_batches) > 0:
-            break
-        sleep(1)
+    proof_batches = wait_until(lambda: get_proof_batches(batch_receiver_url))
     pb = ProofBatch(**proof_batches[-1])
     
     clear_batches(batch_receiver_url)
     incorrect_pb = create_incorrect_batch(pb, n=10, n_invalid=3)
     client.start_validation()
     client.validate(incorrect_pb)
-    sleep(5)  # Give time for validation to complete and batch to be sent
     timeout = 60
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        val_proof_batches = get_val_proof_batches(batch_receiver_url)
-        if len(val_proof_batches) > 0:
-            break
-        sleep(1)
+    val_proof_batches = wait_until(lambda: get_val_proof_batches(batch_receiver_url), timeout=timeout)
     assert len(val_proof_batches) > 0, f"No validated batches received after {timeout} seconds"
     vpb = ValidatedBatch(**val_proof_batches[-1])
 
@@ -216,18 +225,20 @@ def test_fresh_init(client, server_urls, model_params, node_id, node_count):
         params=model_params,
     )
     proof_batch = None
-    while True:
-        proof_batches = [
-            ProofBatch(**batch)
-            for batch in get_proof_batches(batch_receiver_url)
-        ]
-        if proof_batch is not None and len(proof_batch) > 0:
-            proof_batches.append(proof_batch)
-        proof_batch = ProofBatch.merge(proof_batches)
-        if len(proof_batch) > 100:
-            break
-        
-        sleep(1)
+    n_seen = 0  # the receiver only appends until cleared, so new batches are a suffix
+
+    def collect():
+        nonlocal proof_batch, n_seen
+        batches = get_proof_batches(batch_receiver_url)
+        new_batches = [ProofBatch(**batch) for batch in batches[n_seen:]]
+        n_seen = len(batches)
+        if new_batches:
+            if proof_batch is not None:
+                new_batches.insert(0, proof_batch)
+            proof_batch = ProofBatch.merge(new_batches)
+        return proof_batch is not None and len(proof_batch) > 100
+
+    wait_until(collect)
 
     proof_batch = proof_batch.sort_by_nonce()
     expected_nonces = list(range(node_id, node_id + node_count * 20, node_count))
@@ -1,8 +1,12 @@
-from typing import List, Tuple
+from bisect import bisect_right
+from collections import Counter
+from itertools import accumulate
+from typing import List, Optional, Tuple
 from hashlib import sha256
 
 
 N_SLOTS = 64
+MAX_SLOTS = 2 * N_SLOTS  # fallback stops here if no consensus yet
 
 
 def get_weights() -> List[Tuple[str, int]]:
@@ -13,29 +17,60 @@ def get_weights() -> List[Tuple[str, int]]:
     ]
 
 
+def _seed_prefix(app_hash: str, host_address: str) -> bytes:
+    """Seed bytes shared by every slot of a host."""
+    return f"{app_hash}{host_address}".encode()
+
+
 def _slot_random_val(
-    app_hash: str,
-    host_address: str,
+    prefix: bytes,
     slot_idx: int,
     total_weight: int,
 ) -> int:
-    """Generate deterministic random value for a slot index."""
-    seed_data = f"{app_hash}{host_address}{slot_idx}".encode()
-    hash_bytes = sha256(seed_data).digest()
+    """
+    Generate deterministic random value for a slot index.
+    The seed is prefix + decimal slot index, matching slotRandomVal in slots.go.
+    """
+    hash_bytes = sha256(prefix + str(slot_idx).encode()).digest()
     return int.from_bytes(hash_bytes[:8], "big") % total_weight
 
 
+def _slot_random_vals(
+    prefix: bytes,
+    start_idx: int,
+    n_slots: int,
+    total_weight: int,
+) -> List[int]:
+    """
+    Random values for slot indices [start_idx, start_idx + n_slots).
+    The prefix is absorbed once; each slot hashes from a copy of that state.
+    """
+    base = sha256(prefix)
+    values = []
+    for slot_idx in range(start_idx, start_idx + n_slots):
+        h = base.copy()
+        h.update(str(slot_idx).encode())
+        values.append(int.from_bytes(h.digest()[:8], "big") % total_weight)
+    return values
+
+
+def _cumulative_weights(
+    all_weights: List[Tuple[str, int]],
+) -> Tuple[List[str], List[int]]:
+    """Addresses and their cumulative weight upper bounds, in weight order."""
+    addresses = [address for address, _ in all_weights]
+    cumulative = list(accumulate(weight for _, weight in all_weights))
+    return addresses, cumulative
+
+
 def _find_slot_address(
     random_val: int,
-    all_weights: List[Tuple[str, int]],
+    addresses: List[str],
+    cumulative: List[int],
 ) -> str:
-    """Find which address a random value maps to (linear search)."""
-    cumulative = 0
-    for address, weight in all_weights:
-        cumulative += weight
-        if random_val < cumulative:
-            return address
-    return all_weights[-1][0]  # fallback to last
+    """Find which address a random value maps to (binary search)."""
+    idx = bisect_right(cumulative, random_val)
+    return addresses[min(idx, len(addresses) - 1)]  # fallback to last
 
 
 def get_slot(
@@ -43,16 +78,21 @@ def get_slot(
     host_address: str,
     all_weights: List[Tuple[str, int]],
     slot_idx: int,
+    weight_index: Optional[Tuple[List[str], List[int]]] = None,
 ) -> str:
     """
-    Get a single slot by index. O(n_weights).
+    Get a single slot by index. O(n_weights), or O(log n_weights) when
+    weight_index from _cumulative_weights is passed in.
     Use this for incremental slot fetching.
     """
-    total_weight = sum(w for _, w in all_weights)
+    if weight_index is None:
+        weight_index = _cumulative_weights(all_weights)
+    addresses, cumulative = weight_index
+    total_weight = cumulative[-1] if cumulative else 0
     if total_weight == 0:
         return None
-    random_val = _slot_random_val(app_hash, host_address, slot_idx, total_weight)
-    return _find_slot_address(random_val, all_weights)
+    random_val = _slot_random_val(_seed_prefix(app_hash, host_address), slot_idx, total_weight)
+    return _find_slot_address(random_val, addresses, cumulative)
 
 
 def get_slots(
@@ -61,6 +101,7 @@ def get_slots(
     all_weights: List[Tuple[str, int]],
     n_slots: int,
     start_idx: int = 0,
+    weight_index: Optional[Tuple[List[str], List[int]]] = None,
 ) -> List[str]:
     """
     Sample n_slots nodes based on weight distribution.
@@ -73,34 +114,22 @@ def get_slots(
     Args:
         start_idx: Starting slot index (default 0)
         n_slots: Number of slots to return
+        weight_index: Optional precomputed _cumulative_weights(all_weights)
     
     Returns slots for indices [start_idx, start_idx + n_slots)
     
-    Complexity: O(n_slots log n_slots + n_weights)
+    Complexity: O(n_slots log n_weights + n_weights)
     """
-    total_weight = sum(w for _, w in all_weights)
+    if weight_index is None:
+        weight_index = _cumulative_weights(all_weights)
+    addresses, cumulative = weight_index
+    total_weight = cumulative[-1] if cumulative else 0
     if total_weight == 0:
         return []
 
-    randoms = []
-    for i in range(n_slots):
-        slot_idx = start_idx + i
-        random_val = _slot_random_val(app_hash, host_address, slot_idx, total_weight)
-        randoms.append((random_val, i))
-
-    randoms.sort()
-    result = [None] * n_slots
-    cumulative = 0
-    rand_idx = 0
-
-    for address, weight in all_weights:
-        cumulative += weight
-        while rand_idx < len(randoms) and randoms[rand_idx][0] < cumulative:
-            _, orig_idx = randoms[rand_idx]
-            result[orig_idx] = address
-            rand_idx += 1
-
-    return result
+    prefix = _seed_prefix(app_hash, host_address)
+    random_vals = _slot_random_vals(prefix, start_idx, n_slots, total_weight)
+    return [_find_slot_address(random_val, addresses, cumulative) for random_val in random_vals]
 
 def get_vote_from(
     host: str,
@@ -112,31 +141,32 @@ def get_vote_from(
 def validate_host(
     app_hash: str,
     host: str,
+    max_slots: int = MAX_SLOTS,
 ) -> bool:
     prev_weights = get_weights()
-    slots = get_slots(app_hash, host, prev_weights, N_SLOTS)
-    validator_votes = {}
-    for slot in slots:
-        if slot not in validator_votes:
-            validator_votes[slot] = get_vote_from(slot)
-
-    voted_yes = 0
-    voted_no = 0
-    for validator in slots:
-        if validator_votes[validator]:
-            voted_yes += 1
-        else:
-            voted_no += 1
+    # Computed once and shared by the initial sample and every fallback slot
+    weight_index = _cumulative_weights(prev_weights)
+    cumulative = weight_index[1]
+    total_weight = cumulative[-1] if cumulative else 0
+    if total_weight == 0:
+        return None
+    slots = get_slots(app_hash, host, prev_weights, N_SLOTS, weight_index=weight_index)
+    slot_counts = Counter(slots)
+    validator_votes = {slot: get_vote_from(slot) for slot in slot_counts}
+
+    voted_yes = sum(count for slot, count in slot_counts.items() if validator_votes[slot])
+    voted_no = len(slots) - voted_yes
     if voted_yes > N_SLOTS / 2:
         return True
     elif voted_no > N_SLOTS / 2:
         return False
     
-    # Fallback: fetch one slot at a time until consensus
+    # Fallback: fetch one slot at a time until consensus, up to max_slots.
+    # The bound is a slot count; total_weight is in weight units and only
+    # happened to exceed N_SLOTS for the demo weights.
     slot_idx = N_SLOTS
-    total_weight = sum(w for _, w in prev_weights)
-    while slot_idx < total_weight:
-        next_slot = get_slot(app_hash, host, prev_weights, slot_idx)
+    while slot_idx < max_slots:
+        next_slot = get_slot(app_hash, host, prev_weights, slot_idx, weight_index=weight_index)
         if next_slot not in validator_votes:
             validator_votes[next_slot] = get_vote_from(next_slot)
         if validator_votes[next_slot]: